@@ -5,43 +5,128 @@ City graph for the EV routing problem
 import math
 from typing import Dict, List, Tuple, Set
 
+import numpy as np
+
+# The city layout is fixed, so every derived table below is computed once
+# at import time; CityGraph.__init__ only aliases these constants.
+
+# Graph edges: {node: [(neighbor, distance), ...]}
+_GRAPH: Dict[str, List[Tuple[str, float]]] = {
+    'A': [('B', 3.6), ('C', 5.1)],
+    'B': [('A', 3.6), ('C', 3.2), ('D', 4.2), ('F', 2.8)],
+    'C': [('A', 5.1), ('B', 3.2), ('D', 4.6), ('E', 3.7), ('G', 4.1)],
+    'D': [('B', 4.2), ('C', 4.6), ('E', 2.5), ('H', 3.9)],
+    'E': [('C', 3.7), ('D', 2.5), ('I', 4.3)],
+    'F': [('B', 2.8), ('G', 3.5), ('J', 4.7)],
+    'G': [('C', 4.1), ('F', 3.5), ('H', 2.9), ('K', 3.8)],
+    'H': [('D', 3.9), ('G', 2.9), ('I', 3.2)],
+    'I': [('E', 4.3), ('H', 3.2), ('J', 2.6)],
+    'J': [('F', 4.7), ('I', 2.6), ('K', 3.4)],
+    'K': [('G', 3.8), ('J', 3.4)]
+}
+
+# Node coordinates for visualization and heuristic calculation
+_COORDS: Dict[str, Tuple[float, float]] = {
+    'A': (0, 0),
+    'B': (3.6, 0),
+    'C': (5, 3),
+    'D': (8.5, 2.5),
+    'E': (10, 5),
+    'F': (2, -3),
+    'G': (7, 0),
+    'H': (11, 1),
+    'I': (13, 4),
+    'J': (5, -5),
+    'K': (10, -2)
+}
+
+# Charging stations - only some nodes have them
+_CHARGING_STATIONS: Set[str] = {'C', 'E', 'G', 'I', 'K'}
+
+# Precomputed distance to the nearest charging station for every node,
+# so A* doesn't redo the sqrt-over-stations loop on each expansion.
+# One branchless NumPy reduction over the node x station grid replaces
+# the per-node Python min() loop
+_STN_XY: np.ndarray = np.array(
+    [_COORDS[s] for s in _CHARGING_STATIONS], dtype=np.float32)
+_node_xy = np.array(list(_COORDS.values()), dtype=np.float32)
+_min_station_d = np.min(
+    np.hypot(_node_xy[:, None, 0] - _STN_XY[:, 0],
+             _node_xy[:, None, 1] - _STN_XY[:, 1]), axis=1)
+_H_TABLE: Dict[str, float] = {
+    node: 0.0 if node in _CHARGING_STATIONS else float(_min_station_d[i])
+    for i, node in enumerate(_COORDS)
+}
+
+# Integer node IDs and CSR adjacency for the search hot loop: int keys
+# hash faster than strings, and the whole graph lives in three
+# contiguous arrays so neighbor expansion is a plain slice
+_NODE_ID: Dict[str, int] = {node: i for i, node in enumerate(_COORDS)}
+_ID_NODE: List[str] = list(_COORDS)
+_INDPTR: np.ndarray = np.zeros(len(_ID_NODE) + 1, dtype=np.int32)
+np.cumsum([len(_GRAPH[node]) for node in _ID_NODE], out=_INDPTR[1:])
+_INDICES: np.ndarray = np.array(
+    [_NODE_ID[nb] for node in _ID_NODE for nb, _ in _GRAPH[node]],
+    dtype=np.int32)
+_WEIGHTS: np.ndarray = np.array(
+    [d for node in _ID_NODE for _, d in _GRAPH[node]],
+    dtype=np.float64)  # float64: float32 rounds 3.2 up, breaking the
+                       # battery check when capacity equals an edge weight
+_STATION_MASK: np.ndarray = np.array(
+    [node in _CHARGING_STATIONS for node in _ID_NODE], dtype=np.bool_)
+_H_BY_ID: np.ndarray = np.array(
+    [_H_TABLE[node] for node in _ID_NODE], dtype=np.float32)
+_MAX_EDGE_WEIGHT: float = float(_WEIGHTS.max())
+
+def _floyd_warshall() -> Tuple[np.ndarray, np.ndarray]:
+    """All-pairs shortest paths with a next-hop matrix for reconstruction"""
+    n = len(_ID_NODE)
+    dist = np.full((n, n), np.inf, dtype=np.float32)
+    next_hop = np.full((n, n), -1, dtype=np.int32)
+    for i in range(n):
+        dist[i, i] = 0.0
+        next_hop[i, i] = i
+    for u in range(n):
+        for k in range(_INDPTR[u], _INDPTR[u + 1]):
+            v = _INDICES[k]
+            dist[u, v] = _WEIGHTS[k]
+            next_hop[u, v] = v
+    for k in range(n):
+        for i in range(n):
+            for j in range(n):
+                if dist[i, k] + dist[k, j] < dist[i, j]:
+                    dist[i, j] = dist[i, k] + dist[k, j]
+                    next_hop[i, j] = next_hop[i, k]
+    return dist, next_hop
+
+# With 11 nodes this is ~1300 relaxations done once per process; any
+# query whose battery covers the longest edge is answered straight from it
+_ALL_PAIRS_SHORTEST, _NEXT_HOP = _floyd_warshall()
+
 class CityGraph:
     """City graph with nodes, edges, and charging stations"""
 
     def __init__(self):
-        """Setup the city graph with all the connections"""
-        # Graph edges: {node: [(neighbor, distance), ...]}
-        self.graph: Dict[str, List[Tuple[str, float]]] = {
-            'A': [('B', 3.6), ('C', 5.1)],
-            'B': [('A', 3.6), ('C', 3.2), ('D', 4.2), ('F', 2.8)],
-            'C': [('A', 5.1), ('B', 3.2), ('D', 4.6), ('E', 3.7), ('G', 4.1)],
-            'D': [('B', 4.2), ('C', 4.6), ('E', 2.5), ('H', 3.9)],
-            'E': [('C', 3.7), ('D', 2.5), ('I', 4.3)],
-            'F': [('B', 2.8), ('G', 3.5), ('J', 4.7)],
-            'G': [('C', 4.1), ('F', 3.5), ('H', 2.9), ('K', 3.8)],
-            'H': [('D', 3.9), ('G', 2.9), ('I', 3.2)],
-            'I': [('E', 4.3), ('H', 3.2), ('J', 2.6)],
-            'J': [('F', 4.7), ('I', 2.6), ('K', 3.4)],
-            'K': [('G', 3.8), ('J', 3.4)]
-        }
-
-        # Node coordinates for visualization and heuristic calculation
-        self.coords: Dict[str, Tuple[float, float]] = {
-            'A': (0, 0),
-            'B': (3.6, 0),
-            'C': (5, 3),
-            'D': (8.5, 2.5),
-            'E': (10, 5),
-            'F': (2, -3),
-            'G': (7, 0),
-            'H': (11, 1),
-            'I': (13, 4),
-            'J': (5, -5),
-            'K': (10, -2)
-        }
-
-        # Charging stations - only some nodes have them
-        self.charging_stations: Set[str] = {'C', 'E', 'G', 'I', 'K'}
+        """Alias the precomputed city tables - construction is pointer copies"""
+        self.graph = _GRAPH
+        self.coords = _COORDS
+        self.charging_stations = _CHARGING_STATIONS
+        self._stn_xy = _STN_XY
+        self._closest_station_h = _H_TABLE
+        self.node_id = _NODE_ID
+        self.id_node = _ID_NODE
+        self.indptr = _INDPTR
+        self.indices = _INDICES
+        self.weights = _WEIGHTS
+        self.station_mask = _STATION_MASK
+        self.h_by_id = _H_BY_ID
+        self.max_edge_weight = _MAX_EDGE_WEIGHT
+        self.all_pairs_shortest = _ALL_PAIRS_SHORTEST
+        self.next_hop = _NEXT_HOP
+
+        # Lazy cache for pairwise heuristic distances (per instance since
+        # it is the only mutable table)
+        self._h_cache: Dict[Tuple[str, str], float] = {}
 
     def neighbors(self, node: str) -> List[Tuple[str, float]]:
         """Get neighbors of a node"""
@@ -49,9 +134,15 @@ class CityGraph:
 
     def heuristic(self, node: str, goal: str) -> float:
         """Straight line distance between two nodes"""
+        key = (node, goal)
+        cached = self._h_cache.get(key)
+        if cached is not None:
+            return cached
         x1, y1 = self.coords[node]
         x2, y2 = self.coords[goal]
-        return math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        distance = math.hypot(x2 - x1, y2 - y1)
+        self._h_cache[key] = distance
+        return distance
 
     def is_charging_station(self, node: str) -> bool:
         """Check if node is a charging station"""
@@ -59,11 +150,4 @@ class CityGraph:
 
     def get_closest_charging_station_heuristic(self, node: str) -> float:
         """Distance to nearest charging station"""
-        if self.is_charging_station(node):
-            return 0.0
-
-        min_distance = float('inf')
-        for station in self.charging_stations:
-            distance = self.heuristic(node, station)
-            min_distance = min(min_distance, distance)
-        return min_distance
+        return self._closest_station_h[node]
@@ -9,9 +9,13 @@ from search.algorithms import UniformCostSearch, AStarSearch
 class TestSearchAlgorithms(unittest.TestCase):
     """Test the search algorithms"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the graph once - it is read-only across all tests"""
+        cls.graph = CityGraph()
+
     def setUp(self):
         """Setup for tests"""
-        self.graph = CityGraph()
         self.start = 'A'
 
     def test_ucs_finds_path_normal_battery(self):
@@ -96,6 +100,16 @@ class TestSearchAlgorithms(unittest.TestCase):
         self.assertEqual(ucs_result.cost, float('inf'))
         self.assertEqual(astar_result.cost, float('inf'))
 
+    def test_battery_exactly_equal_to_edge_weight(self):
+        """Battery equal to an edge weight should still allow the move"""
+        # B -> C costs exactly 3.2; the feasibility check is <=, so this
+        # must succeed (guards against rounding the weights upward)
+        battery = 3.2
+        for algorithm in [UniformCostSearch, AStarSearch]:
+            result = algorithm(self.graph, 'B', battery).search()
+            self.assertEqual(result.path, ['B', 'C'])
+            self.assertAlmostEqual(result.cost, 3.2)
+
     def test_path_validity_ucs(self):
         """Check UCS paths are valid"""
         battery = 6.0
@@ -163,6 +177,19 @@ class TestSearchAlgorithms(unittest.TestCase):
         self.assertTrue(self.graph.is_charging_station(ucs_result.path[-1]))
         self.assertTrue(self.graph.is_charging_station(astar_result.path[-1]))
 
+    def test_unconstrained_battery_matches_all_pairs(self):
+        """High-battery results should agree with the all-pairs tables"""
+        battery = 20.0  # Covers every edge, so the precomputed answer applies
+        for start in self.graph.coords:
+            start_id = self.graph.node_id[start]
+            expected = min(self.graph.all_pairs_shortest[start_id][self.graph.node_id[s]]
+                           for s in self.graph.charging_stations)
+
+            for algorithm in [UniformCostSearch, AStarSearch]:
+                result = algorithm(self.graph, start, battery).search()
+                self.assertAlmostEqual(result.cost, expected, places=3)
+                self.assertTrue(self.graph.is_charging_station(result.path[-1]))
+
     def test_graph_connectivity(self):
         """Graph should be connected"""
         # Test that all nodes have neighbors
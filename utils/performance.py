@@ -6,7 +6,7 @@ import time
 from dataclasses import dataclass
 from typing import List
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Stores results from search algorithms"""
     path: List[str]  # Path from start to goal
@@ -17,9 +17,30 @@ class SearchResult:
 def time_function(func):
     """Timer decorator for functions"""
     def wrapper(*args, **kwargs):
-        start_time = time.perf_counter()
+        start_ns = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        execution_time = end_time - start_time
-        return result, execution_time
+        end_ns = time.perf_counter_ns()
+        # perf_counter_ns is an integer clock read - no float rounding
+        return result, (end_ns - start_ns) / 1e9
     return wrapper
+
+class timed:
+    """
+    Context-manager timer with no wrapper-frame overhead.
+
+    Usage: `with timed() as t:` then read `t.ns` (or `t.seconds`).
+    """
+    __slots__ = ('start_ns', 'ns')
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.ns = time.perf_counter_ns() - self.start_ns
+        return False
+
+    @property
+    def seconds(self) -> float:
+        """Elapsed time converted to seconds"""
+        return self.ns / 1e9